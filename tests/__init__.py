@@ -0,0 +1,15 @@
+"""
+Test Package for the Account Service
+
+The tests run against an in-memory SQLite database unless DATABASE_URI
+points them at PostgreSQL. The database is picked here because importing
+the service connects to it before any test module runs, and under
+pytest-xdist each worker has to create its tables in its own database.
+"""
+import os
+
+from tests.databases import worker_database_uri
+
+os.environ["DATABASE_URI"] = worker_database_uri(
+    os.environ.get("DATABASE_URI", "sqlite:///:memory:")
+)
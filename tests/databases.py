@@ -0,0 +1,54 @@
+"""
+Test Database Helpers
+
+This module must not import the service, it is used to pick the database
+before the service connects to it.
+"""
+import os
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+
+
+def worker_database_uri(database_uri):
+    """
+    Returns a database URI private to the current pytest-xdist worker
+
+    Outside of xdist the URI is returned unchanged. When running under
+    xdist the worker id (gw0, gw1, ...) is appended to the database name
+    so that workers never create tables in or clean up each other's
+    databases. PostgreSQL databases are created on first use and are left
+    in place on purpose so the next run can reuse them.
+    """
+    worker = os.getenv("PYTEST_XDIST_WORKER")
+    if not worker:
+        return database_uri
+
+    url = make_url(database_uri)
+    if url.get_backend_name() == "sqlite":
+        if url.database in (None, "", ":memory:"):
+            # every worker is its own process with its own in-memory database
+            return database_uri
+        root, ext = os.path.splitext(url.database)
+        return str(url.set(database=f"{root}_{worker}{ext}"))
+
+    # like libpq, fall back to the user name when no database is given
+    database = url.database or url.username or "postgres"
+    worker_url = url.set(database=f"{database}_{worker}")
+    _create_database(url, worker_url.database)
+    return str(worker_url)
+
+
+def _create_database(url, name):
+    """Creates the named database using the server reachable at url"""
+    engine = create_engine(url, isolation_level="AUTOCOMMIT")
+    try:
+        with engine.connect() as connection:
+            exists = connection.execute(
+                text("SELECT 1 FROM pg_database WHERE datname = :name"),
+                {"name": name},
+            ).scalar()
+            if not exists:
+                connection.execute(text(f'CREATE DATABASE "{name}"'))
+    finally:
+        engine.dispose()
@@ -0,0 +1,90 @@
+"""
+Test cases for the Test Utilities
+"""
+import socket
+from unittest import TestCase
+
+from service.routes import app
+from tests.utils import GuardedSocket, NetworkAccessError, OrjsonClient, block_network
+
+
+class TestBlockNetwork(TestCase):
+    """Test the network guard"""
+
+    def setUp(self):
+        self.unguarded = socket.socket
+        self.addCleanup(setattr, socket, "socket", self.unguarded)
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.bind(("127.0.0.1", 0))
+        self.server.listen()
+        self.addCleanup(self.server.close)
+        self.port = self.server.getsockname()[1]
+
+    def test_block_non_loopback(self):
+        """It should refuse to connect to a non-loopback address"""
+        block_network()
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            # 203.0.113.0/24 is reserved for documentation (RFC 5737)
+            sock.settimeout(0.1)  # fail quickly should the guard let it through
+            self.assertRaises(NetworkAccessError, sock.connect, ("203.0.113.1", 80))
+            self.assertRaises(NetworkAccessError, sock.connect_ex, ("203.0.113.1", 80))
+
+    def test_allow_loopback(self):
+        """It should connect to 127.0.0.1 and localhost"""
+        block_network()
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.connect(("127.0.0.1", self.port))
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.connect(("localhost", self.port))
+        with socket.create_connection(("localhost", self.port)):
+            pass
+
+    def test_allow_ipv6_loopback(self):
+        """It should connect to ::1"""
+        if not socket.has_ipv6:
+            self.skipTest("IPv6 is not available")
+        block_network()
+        try:
+            sock = socket.socket(socket.AF_INET6, socket.SOCK_STREAM)
+        except OSError:
+            self.skipTest("IPv6 is not available")
+        with sock:
+            # a refused connection is fine, only the guard must not raise
+            self.assertIsInstance(sock.connect_ex(("::1", self.port)), int)
+
+    def test_restore_socket(self):
+        """It should return the original socket class so it can be restored"""
+        original = block_network()
+        self.assertIs(socket.socket, GuardedSocket)
+        self.assertIs(original, self.unguarded)
+        socket.socket = original
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            self.assertNotIsInstance(sock, GuardedSocket)
+
+    def test_block_network_twice(self):
+        """It should still return the original socket class when called again"""
+        block_network()
+        self.assertIs(block_network("localhost"), self.unguarded)
+
+
+class TestOrjsonClient(TestCase):
+    """Test the orjson test client"""
+
+    def setUp(self):
+        self.client = OrjsonClient(app, app.response_class)
+
+    def test_json_body(self):
+        """It should send json= as an application/json body"""
+        request = self.client.post("/", json={"name": "é"}).request
+        self.assertEqual(request.content_type, "application/json")
+        self.assertEqual(request.get_data(), '{"name":"é"}'.encode())
+
+    def test_json_none(self):
+        """It should send no body for json=None"""
+        request = self.client.post("/", json=None).request
+        self.assertEqual(request.get_data(), b"")
+        self.assertIsNone(request.content_type)
+
+    def test_json_and_data(self):
+        """It should not accept both json= and data="""
+        self.assertRaises(TypeError, self.client.post, "/", json={}, data="{}")
@@ -0,0 +1,132 @@
+"""
+Test Utilities shared by the test suites
+"""
+import ipaddress
+import socket
+
+import orjson
+from flask.testing import FlaskClient
+from sqlalchemy import event, text
+
+from service.models import db, Account
+
+
+class NetworkAccessError(Exception):
+    """Used when a test tries to connect to a host outside the test environment"""
+
+
+class OrjsonClient(FlaskClient):
+    """
+    Test client that encodes json= payloads and decodes get_json() with orjson
+
+    The application keeps its own JSON encoder and decoder, so the routes are
+    still tested the way they run in production.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.response_wrapper = type(
+            "OrjsonTestResponse", (self.response_wrapper,), {"json_module": orjson}
+        )
+
+    def open(self, *args, **kwargs):  # pylint: disable=arguments-differ
+        # mirror werkzeug's handling of json=, only the encoder differs
+        if kwargs.get("json") is not None:
+            if kwargs.get("data") is not None:
+                raise TypeError("can't provide both json and data")
+            kwargs["data"] = orjson.dumps(kwargs.pop("json"))
+            if kwargs.get("content_type") is None:
+                kwargs["content_type"] = "application/json"
+        return super().open(*args, **kwargs)
+
+
+class GuardedSocket(socket.socket):
+    """Socket that only connects to loopback and allowed hosts"""
+
+    allowed = frozenset()
+    unguarded = socket.socket
+
+    def connect(self, address):
+        if self.family in (socket.AF_INET, socket.AF_INET6):
+            _check_address(address, self.allowed)
+        return super().connect(address)
+
+    def connect_ex(self, address):
+        if self.family in (socket.AF_INET, socket.AF_INET6):
+            _check_address(address, self.allowed)
+        return super().connect_ex(address)
+
+
+def block_network(*allowed_hosts):
+    """
+    Replaces socket.socket with one that refuses non-loopback connections
+
+    Args:
+        allowed_hosts (string): additional hosts that may be reached, e.g. the database
+
+    Returns the original socket class so that it can be restored.
+    """
+    allowed = set()
+    for host in filter(None, allowed_hosts):
+        allowed.add(host)
+        try:
+            allowed.update(info[4][0] for info in socket.getaddrinfo(host, None))
+        except OSError:
+            pass  # unresolvable hosts can only be reached by name
+
+    if socket.socket is not GuardedSocket:
+        GuardedSocket.unguarded = socket.socket
+        socket.socket = GuardedSocket
+    GuardedSocket.allowed = frozenset(allowed)
+    return GuardedSocket.unguarded
+
+
+def _check_address(address, allowed):
+    """Raises NetworkAccessError unless address is loopback or an allowed host"""
+    host = address[0]
+    if host in allowed or host == "localhost":
+        return
+    try:
+        if ipaddress.ip_address(host.split("%")[0]).is_loopback:
+            return
+    except ValueError:
+        pass
+    raise NetworkAccessError(f"Tests must not connect to {address}")
+
+
+def truncate_accounts():
+    """Removes every Account and restarts the id sequence"""
+    table = Account.__tablename__
+    if db.engine.dialect.name == "postgresql":
+        db.session.execute(text(f"TRUNCATE TABLE {table} RESTART IDENTITY CASCADE"))
+    else:
+        # without AUTOINCREMENT SQLite restarts the ids once the table is empty
+        db.session.execute(text(f"DELETE FROM {table}"))
+    db.session.commit()
+
+
+def disable_synchronous_commit():
+    """
+    Turns off synchronous_commit on every PostgreSQL connection of the engine
+
+    Nothing the tests write has to survive a crash, so commits need not wait
+    for the WAL to reach the disk. Pooled connections are dropped so that they
+    reconnect with the setting. SQLite is left alone, its in-memory default
+    never syncs and disposing of it would throw the database away.
+    """
+    engine = db.engine
+    if engine.dialect.name != "postgresql":
+        return
+    if event.contains(engine, "connect", _synchronous_commit_off):
+        return
+    event.listen(engine, "connect", _synchronous_commit_off)
+    engine.dispose()
+
+
+def _synchronous_commit_off(dbapi_connection, connection_record):  # pylint: disable=unused-argument
+    """Sets synchronous_commit = off for the new connection's session"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("SET synchronous_commit = off")
+    cursor.close()
+    # commit so that the pool's reset-on-return rollback keeps the setting
+    dbapi_connection.commit()